@@ -7,15 +7,17 @@ to connect students with the PROUNI ML prediction API.
 Requirements:
     - GOOGLE_API_KEY environment variable set
     - Local PROUNI API running on localhost:8000
-    - pip install google-genai requests python-dotenv
+    - pip install google-genai httpx python-dotenv
 
 Usage:
     python examples/gemini_client.py
 """
+import asyncio
 import os
 import sys
+from collections import OrderedDict
 
-import requests
+import httpx
 from google import genai
 from dotenv import load_dotenv
 
@@ -25,8 +27,20 @@ load_dotenv()
 API_ENDPOINT = os.getenv("PROUNI_API_URL", "http://localhost:8000/adk/predict-bolsa")
 GEMINI_MODEL = "gemini-2.0-flash-exp"
 
+# Tool result cache: the same student profile is only sent to the API once
+TOOL_CACHE_SIZE = 256
 
-def consultar_sistema_prouni(
+# Shared async HTTP client: keeps connections to the PROUNI API alive between tool calls
+_HTTP_CLIENT = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=10,
+)
+
+# LRU of API results keyed by the normalized payload (least recently used first)
+_TOOL_CACHE: OrderedDict[tuple, dict] = OrderedDict()
+
+
+async def consultar_sistema_prouni(
     idade: int,
     curso: str,
     uf: str,
@@ -59,8 +73,7 @@ def consultar_sistema_prouni(
         "curso": curso.upper(),
         "uf": uf.upper(),
         "sexo": sexo.upper(),
-        "raca": raca.upper(),from pathlib import Path
-
+        "raca": raca.upper(),
         "turno": turno.upper(),
         "pcd": pcd,
         "modalidade": modalidade.upper()
@@ -69,20 +82,32 @@ def consultar_sistema_prouni(
     if municipio:
         payload["municipio"] = municipio.upper()
     
+    # Same profile asked again (paraphrase, follow-up): reuse the API result
+    key = tuple(sorted(payload.items()))
+    cached = _TOOL_CACHE.get(key)
+    if cached is not None:
+        _TOOL_CACHE.move_to_end(key)
+        print(f"\n✅ Resultado (cache): {cached['tipo_bolsa']}")
+        return cached
+    
     print(f"\nConsultando API: {API_ENDPOINT}")
     print(f"Payload: {payload}")
 
     try:
-        response = requests.post(API_ENDPOINT, json=payload, timeout=10)
+        response = await _HTTP_CLIENT.post(API_ENDPOINT, json=payload)
         response.raise_for_status()
         resultado = response.json()
         
         print(f"✅ Resultado: {resultado['tipo_bolsa']} "
               f"({resultado['probabilidade_integral']:.1f}% integral)")
         
+        # Only successful predictions are worth reusing
+        _TOOL_CACHE[key] = resultado
+        if len(_TOOL_CACHE) > TOOL_CACHE_SIZE:
+            _TOOL_CACHE.popitem(last=False)
         return resultado
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Erro na conexão com API local: {str(e)}"
         print(f"{error_msg}")
         return {"erro": error_msg}
@@ -103,7 +128,70 @@ def setup_gemini_client():
     return client
 
 
-def run_interactive_session(client):
+# Gemini tool: a single Tool holding every FunctionDeclaration
+PROUNI_TOOL = {
+    "function_declarations": [{
+        "name": "consultar_sistema_prouni",
+        "description": "Consulta o sistema ML do PROUNI para prever tipo de bolsa (INTEGRAL ou PARCIAL) com base no perfil do estudante",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "idade": {
+                    "type": "integer",
+                    "description": "Idade do estudante (14-80 anos)"
+                },
+                "curso": {
+                    "type": "string",
+                    "description": "Nome do curso desejado (ex: DIREITO, MEDICINA, ENGENHARIA)"
+                },
+                "uf": {
+                    "type": "string",
+                    "description": "Estado brasileiro (sigla, ex: SP, RJ, MG)"
+                },
+                "sexo": {
+                    "type": "string",
+                    "description": "Sexo (M ou F)"
+                },
+                "raca": {
+                    "type": "string",
+                    "description": "Raça/cor autodeclarada: BRANCA, PRETA, PARDA, AMARELA, INDIGENA",
+                    "default": "PARDA"
+                },
+                "turno": {
+                    "type": "string",
+                    "description": "Turno do curso: MATUTINO, VESPERTINO, NOTURNO, INTEGRAL",
+                    "default": "NOTURNO"
+                },
+                "municipio": {
+                    "type": "string",
+                    "description": "Nome da cidade (opcional)"
+                },
+                "pcd": {
+                    "type": "boolean",
+                    "description": "É pessoa com deficiência?",
+                    "default": False
+                },
+                "modalidade": {
+                    "type": "string",
+                    "description": "Modalidade de ensino: PRESENCIAL ou EAD",
+                    "default": "PRESENCIAL"
+                }
+            },
+            "required": ["idade", "curso", "uf", "sexo"]
+        }
+    }]
+}
+
+
+def _response_text_parts(response) -> list[str]:
+    """Return the text parts of the first candidate (empty if none)."""
+    if not response.candidates:
+        return []
+    parts = response.candidates[0].content.parts
+    return [part.text for part in parts if getattr(part, "text", None)]
+
+
+async def run_interactive_session(client):
     """Run interactive CLI session."""
     print("\n" + "="*60)
     print("AGENTE PROUNI - Google Gemini + ML Predictions")
@@ -114,64 +202,10 @@ def run_interactive_session(client):
     print("  • Engenharia em MG, turno noturno, tenho 19 anos")
     print("\nDigite 'sair' para encerrar\n")
 
-    # Define the tool for Gemini
-    tool = {
-        "function_declarations": [{
-            "name": "consultar_sistema_prouni",
-            "description": "Consulta o sistema ML do PROUNI para prever tipo de bolsa (INTEGRAL ou PARCIAL) com base no perfil do estudante",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "idade": {
-                        "type": "integer",
-                        "description": "Idade do estudante (14-80 anos)"
-                    },
-                    "curso": {
-                        "type": "string",
-                        "description": "Nome do curso desejado (ex: DIREITO, MEDICINA, ENGENHARIA)"
-                    },
-                    "uf": {
-                        "type": "string",
-                        "description": "Estado brasileiro (sigla, ex: SP, RJ, MG)"
-                    },
-                    "sexo": {
-                        "type": "string",
-                        "description": "Sexo (M ou F)"
-                    },
-                    "raca": {
-                        "type": "string",
-                        "description": "Raça/cor autodeclarada: BRANCA, PRETA, PARDA, AMARELA, INDIGENA",
-                        "default": "PARDA"
-                    },
-                    "turno": {
-                        "type": "string",
-                        "description": "Turno do curso: MATUTINO, VESPERTINO, NOTURNO, INTEGRAL",
-                        "default": "NOTURNO"
-                    },
-                    "municipio": {
-                        "type": "string",
-                        "description": "Nome da cidade (opcional)"
-                    },
-                    "pcd": {
-                        "type": "boolean",
-                        "description": "É pessoa com deficiência?",
-                        "default": False
-                    },
-                    "modalidade": {
-                        "type": "string",
-                        "description": "Modalidade de ensino: PRESENCIAL ou EAD",
-                        "default": "PRESENCIAL"
-                    }
-                },
-                "required": ["idade", "curso", "uf", "sexo"]
-            }
-        }]
-    }
-
     # Start chat with tool
-    chat = client.chats.create(
+    chat = client.aio.chats.create(
         model=GEMINI_MODEL,
-        config={"tools": [tool]}
+        config={"tools": [PROUNI_TOOL]}
     )
 
     while True:
@@ -186,29 +220,38 @@ def run_interactive_session(client):
                 break
             
             # Send message
-            response = chat.send_message(user_msg)
+            response = await chat.send_message(user_msg)
+            if not response.candidates:
+                continue
             
-            # Check if there's a function call
+            # Single pass: collect text and start every tool call right away
+            text_parts = []
+            calls = []
             for part in response.candidates[0].content.parts:
-                if hasattr(part, 'function_call') and part.function_call:
-                    # Execute the function
-                    func_call = part.function_call
-                    if func_call.name == "consultar_sistema_prouni":
-                        result = consultar_sistema_prouni(**dict(func_call.args))
-                        
-                        # Send function result back
-                        response = chat.send_message({
-                            "function_response": {
-                                "name": func_call.name,
-                                "response": result
-                            }
-                        })
+                func_call = getattr(part, "function_call", None)
+                if func_call and func_call.name == "consultar_sistema_prouni":
+                    func_args = dict(func_call.args)
+                    task = asyncio.create_task(consultar_sistema_prouni(**func_args))
+                    calls.append((func_call.name, func_args, task))
+                    continue
+                
+                text = getattr(part, "text", None)
+                if text:
+                    text_parts.append(text)
             
-            # Get final text response
-            final_text = ""
-            for part in response.candidates[0].content.parts:
-                if hasattr(part, 'text'):
-                    final_text += part.text
+            results = []
+            if calls:
+                # Parallel function calls hit the API concurrently
+                results = await asyncio.gather(*(task for _, _, task in calls))
+                
+                # Send all results back; the answer replaces any earlier text
+                response = await chat.send_message([
+                    {"function_response": {"name": name, "response": result}}
+                    for (name, _, _), result in zip(calls, results)
+                ])
+                text_parts = _response_text_parts(response)
+            
+            final_text = "".join(text_parts)
             
             if final_text:
                 print(f"\nAgente: {final_text}\n")
@@ -220,11 +263,14 @@ def run_interactive_session(client):
             print(f"\nErro: {e}\n")
 
 
-def main():
+async def main():
     """Main entry point."""
     client = setup_gemini_client()
-    run_interactive_session(client)
+    try:
+        await run_interactive_session(client)
+    finally:
+        await _HTTP_CLIENT.aclose()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
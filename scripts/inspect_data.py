@@ -1,6 +1,10 @@
+from collections import Counter
 from pathlib import Path
 import pandas as pd
 
+# linhas por bloco: memória fica O(CHUNK_SIZE) em vez de O(arquivo)
+CHUNK_SIZE = 500_000
+
 def inspect_data(df: pd.DataFrame) -> None:
     """
     Inspeciona um DataFrame do pandas e imprime informações úteis sobre ele.
@@ -26,11 +30,32 @@ def inspect_data(df: pd.DataFrame) -> None:
 
 def main() -> None:
     csv_path = Path("data") / "ProuniRelatorioDadosAbertos2020.csv"
-    try:
-        df = pd.read_csv(csv_path, sep=";", encoding="utf-8")
-    except UnicodeDecodeError:
-        df = pd.read_csv(csv_path, sep=";", encoding="utf-8-sig")
-    inspect_data(df)
+    reader = pd.read_csv(csv_path, sep=";", encoding="utf-8-sig", chunksize=CHUNK_SIZE)
+
+    total_rows = 0
+    na_counts = None
+    tb_counts = Counter()
+    for i, chunk in enumerate(reader):
+        if i == 0:
+            # colunas, dtypes e amostra vêm do primeiro bloco
+            print(f"Primeiro bloco ({len(chunk)} linhas):")
+            inspect_data(chunk)
+
+        total_rows += len(chunk)
+        chunk_na = chunk.isna().sum()
+        na_counts = chunk_na if na_counts is None else na_counts.add(chunk_na, fill_value=0)
+        if "TIPO_BOLSA" in chunk.columns:
+            tb_counts.update(chunk["TIPO_BOLSA"].astype("string").value_counts(dropna=False).to_dict())
+
+    if na_counts is None:
+        print("Arquivo vazio")
+        return
+
+    print("\nArquivo completo:")
+    print(f"Shape: ({total_rows}, {len(na_counts)})")
+    print(f"\n Missing values: \n{(na_counts / total_rows * 100).sort_values(ascending=False).round(2).head(10)}")
+    if tb_counts:
+        print("\nTIPO_BOLSA value_counts:\n" + pd.Series(tb_counts).sort_values(ascending=False).to_string())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,18 +5,32 @@ Arquitetura:
 - Lifecycle management: modelo carregado no startup via PredictionService
 - Routers separados: /api/v1 (técnico) e /adk (conversacional)
 - CORS habilitado para integração com frontends
+- Respostas serializadas com orjson (ORJSONResponse), sem validação de saída
+  (response_model=None; os schemas de resposta servem só para o OpenAPI)
 - Lógica centralizada em service.py (sem duplicação)
+- Predições (CPU-bound) executadas em threadpool para não bloquear o event loop
+- Micro-batching: requisições próximas (janela de 5ms) viram um único predict
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
+# Evita oversubscription de threads BLAS/OpenMP com o threadpool de predições
+# (precisa ser definido antes de importar numpy/sklearn)
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
 import uvicorn
 from fastapi import FastAPI, APIRouter, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from prouni_agent.service import PredictionService, get_prediction_service
+from prouni_agent.predict import feature_row
+from prouni_agent.service import PredictionResult, PredictionService, get_prediction_service
 from prouni_agent.schemas import (
     PredictRequest,
     PredictResponse,
@@ -41,6 +55,105 @@ API_PREFIX = "/api/v1"
 ADK_PREFIX = "/adk"
 
 
+# ============================================================================
+# MICRO-BATCHING
+# ============================================================================
+
+class MicroBatcher:
+    """
+    Agrupa predições que chegam numa janela curta em uma única chamada
+    a `PredictionService.predict_rows`, executada no threadpool.
+    
+    Recebe linhas posicionais (`feature_row`/`conversational_row`); linhas
+    já em cache são respondidas na hora, sem esperar a janela.
+    
+    Guarda só uma referência fraca ao serviço: o batcher é o valor em
+    `_batchers`, e uma referência forte manteria a chave viva para sempre.
+    """
+    
+    def __init__(self, service: PredictionService, window: float = 0.005, max_batch: int = 64):
+        self._service_ref = weakref.ref(service)
+        self._window = window
+        self._max_batch = max_batch
+        self._pending: list[tuple[list, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+    
+    @property
+    def _service(self) -> PredictionService:
+        service = self._service_ref()
+        if service is None:
+            raise RuntimeError("Serviço de predição foi descartado")
+        return service
+    
+    async def predict(self, row: list) -> PredictionResult:
+        cached = self._service.get_cached(row)
+        if cached is not None:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+        
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: list[tuple[list, asyncio.Future]]) -> None:
+        rows = [row for row, _ in batch]
+        try:
+            service = self._service
+        except RuntimeError as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        try:
+            results = await asyncio.to_thread(service.predict_rows, rows)
+        except Exception:
+            # Uma linha inválida não derruba o lote: cada uma segue sozinha
+            for row, future in batch:
+                try:
+                    result = await asyncio.to_thread(service.predict_from_row, row)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Um batcher por serviço: respeita app.dependency_overrides[get_prediction_service]
+_batchers: "weakref.WeakKeyDictionary[PredictionService, MicroBatcher]" = weakref.WeakKeyDictionary()
+
+
+def get_batcher(service: PredictionService = Depends(get_prediction_service)) -> MicroBatcher:
+    """Dependency injection: micro-batcher ligado ao serviço injetado."""
+    batcher = _batchers.get(service)
+    if batcher is None:
+        batcher = _batchers[service] = MicroBatcher(service)
+    return batcher
+
+
 # ============================================================================
 # ROUTER PRINCIPAL (/api/v1)
 # ============================================================================
@@ -48,10 +161,10 @@ ADK_PREFIX = "/adk"
 router = APIRouter(prefix=API_PREFIX, tags=["prouni"])
 
 
-@router.get("/", response_model=RootResponse)
+@router.get("/", response_model=None, responses={200: {"model": RootResponse}})
 async def root():
     """Informações da API e endpoints disponíveis."""
-    return RootResponse(
+    return ORJSONResponse(RootResponse(
         message="PROUNI Orientation API - Classificação de bolsas (INTEGRAL vs PARCIAL)",
         version="1.0.0",
         endpoints={
@@ -60,23 +173,23 @@ async def root():
             "adk_predict": f"{ADK_PREFIX}/predict-bolsa",
             "docs": f"{API_PREFIX}/docs",
         }
-    )
+    ))
 
 
-@router.get("/health", response_model=HealthResponse)
+@router.get("/health", response_model=None, responses={200: {"model": HealthResponse}})
 async def health_check(service: PredictionService = Depends(get_prediction_service)):
     """Health check da API com status do modelo."""
-    return HealthResponse(
+    return ORJSONResponse(HealthResponse(
         status="ok" if service.is_loaded else "error",
         model_path=str(service.model_path),
         model_loaded=service.is_loaded,
-    )
+    ))
 
 
-@router.post("/predict", response_model=PredictResponse)
+@router.post("/predict", response_model=None, responses={200: {"model": PredictResponse}})
 async def predict_bolsa(
     req: PredictRequest,
-    service: PredictionService = Depends(get_prediction_service),
+    batcher: MicroBatcher = Depends(get_batcher),
 ):
     """
     Predição de tipo de bolsa (INTEGRAL vs PARCIAL).
@@ -99,13 +212,9 @@ async def predict_bolsa(
             "NOME_TURNO_CURSO_BOLSA": req.nome_turno_curso_bolsa,
         }
         
-        result = service.predict(payload)
+        result = await batcher.predict(feature_row(payload))
         
-        return PredictResponse(
-            label=result.label,
-            proba_integral=result.proba_integral,
-            proba_parcial=result.proba_parcial,
-        )
+        return ORJSONResponse(result.to_response())
         
     except RuntimeError as e:
         logger.error(f"Modelo não carregado: {e}")
@@ -122,20 +231,23 @@ async def predict_bolsa(
 adk_router = APIRouter(prefix=ADK_PREFIX, tags=["adk-integration"])
 
 
-@adk_router.get("/health", response_model=ADKHealthResponse)
+@adk_router.get("/health", response_model=None, responses={200: {"model": ADKHealthResponse}})
 async def adk_health():
     """Health check específico para ADK."""
-    return ADKHealthResponse(
+    return ORJSONResponse(ADKHealthResponse(
         status="ok",
         service="PROUNI Orientation - ADK Integration",
         available_tools=["predict-bolsa"],
-    )
+    ))
 
 
-@adk_router.post("/predict-bolsa", response_model=ADKPredictResponse)
+@adk_router.post(
+    "/predict-bolsa", response_model=None, responses={200: {"model": ADKPredictResponse}}
+)
 async def predict_bolsa_adk(
     req: ADKPredictRequest,
     service: PredictionService = Depends(get_prediction_service),
+    batcher: MicroBatcher = Depends(get_batcher),
 ):
     """
     Predição otimizada para Google ADK (function calling).
@@ -143,8 +255,13 @@ async def predict_bolsa_adk(
     Recebe parâmetros conversacionais (idade, curso, uf) e retorna
     resposta humanizada pronta para apresentação pelo agente.
     """
+    # Requisições inválidas são rejeitadas antes de qualquer trabalho do modelo
+    # (idade, sexo, raça, UF, turno e modalidade já validados pelo schema)
+    if req.curso is not None and not req.curso.strip():
+        raise HTTPException(status_code=422, detail="curso não pode ser vazio")
+    
     try:
-        result = service.predict_from_conversational(
+        row = service.conversational_row(
             idade=req.idade,
             sexo=req.sexo,
             raca=req.raca,
@@ -155,14 +272,9 @@ async def predict_bolsa_adk(
             turno=req.turno,
             modalidade=req.modalidade,
         )
+        result = await batcher.predict(row)
         
-        return ADKPredictResponse(
-            tipo_bolsa=result.label,
-            probabilidade_integral=round(result.proba_integral * 100, 1),
-            probabilidade_parcial=round(result.proba_parcial * 100, 1),
-            confianca=result.confidence_level,
-            mensagem=result.to_message(),
-        )
+        return ORJSONResponse(result.to_adk_response())
         
     except RuntimeError as e:
         logger.error(f"Modelo não carregado: {e}")
@@ -182,6 +294,10 @@ async def lifespan(app: FastAPI):
     # === STARTUP ===
     logger.info("Iniciando PROUNI Orientation API...")
     
+    # Executor padrão usado por asyncio.to_thread nas predições
+    executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+    asyncio.get_running_loop().set_default_executor(executor)
+    
     service = get_prediction_service()
     logger.info(f"Caminho do modelo: {service.model_path}")
     
@@ -196,12 +312,20 @@ async def lifespan(app: FastAPI):
         logger.error(f"Erro ao carregar modelo: {e}")
         raise
     
+    # Warmup: paga as alocações da primeira chamada antes do primeiro usuário
+    try:
+        service.warmup()
+        logger.info("Warmup do modelo concluído")
+    except Exception as e:
+        logger.warning(f"Falha no warmup do modelo: {e}")
+    
     logger.info("API iniciada com sucesso")
     yield
     
     # === SHUTDOWN ===
     logger.info("Finalizando API...")
     service.unload_model()
+    executor.shutdown(wait=False)
     logger.info("Modelo descarregado")
 
 
@@ -221,6 +345,8 @@ def create_app() -> FastAPI:
         docs_url=f"{API_PREFIX}/docs",
         redoc_url=f"{API_PREFIX}/redoc",
         openapi_url=f"{API_PREFIX}/openapi.json",
+        # orjson serializa as respostas bem mais rápido que o json da stdlib
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
     
@@ -256,7 +382,19 @@ if __name__ == "__main__":
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=8000)
     parser.add_argument("--reload", action="store_true")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos uvicorn (cada um carrega o modelo via mmap; ignorado com --reload)",
+    )
     args = parser.parse_args()
     
     logger.info(f"Docs: http://{args.host}:{args.port}{API_PREFIX}/docs")
-    uvicorn.run("prouni_agent.api:app", host=args.host, port=args.port, reload=args.reload)
+    uvicorn.run(
+        "prouni_agent.api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=args.reload,
+    )
@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
 REQUIRED_COLUMNS = [
     "ANO_CONCESSAO_BOLSA",
@@ -19,9 +21,32 @@ REQUIRED_COLUMNS = [
     "NOME_TURNO_CURSO_BOLSA",
 ]
 
+# tipos explícitos: evita inferência coluna a coluna e guarda textos em Arrow
+ARROW_TYPES = {
+    col: pa.string() for col in REQUIRED_COLUMNS if col != "ANO_CONCESSAO_BOLSA"
+} | {"ANO_CONCESSAO_BOLSA": pa.int32()}
+
+# Arrow -> pandas sem passar por object/float: textos como string[pyarrow]
+# (mesmo buffer Arrow) e ano como Int32 nullable
+_PANDAS_TYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.int32(): pd.Int32Dtype(),
+}
+
+NA_TOKENS = ["", "NA", "N/A", "NULL", "None"]
+
+# blocos de 64 MB: cada thread do leitor Arrow processa um bloco por vez
+CSV_BLOCK_SIZE = 64 << 20
+
 def read_prouni_csv(path: str| Path) -> pd.DataFrame:
     """Lê o CSV do Prouni e retorna um DataFrame do pandas.
 
+    Usa o leitor CSV do pyarrow (multi-thread, em blocos de `CSV_BLOCK_SIZE`)
+    lendo apenas `REQUIRED_COLUMNS` com os tipos de `ARROW_TYPES`. A tabela
+    Arrow é liberada coluna a coluna durante a conversão para pandas, então
+    o pico de memória não guarda as duas cópias. O leitor do Arrow já ignora
+    o BOM UTF-8.
+
     Args:
         path (str | Path): Caminho para o arquivo CSV.
 
@@ -29,11 +54,20 @@ def read_prouni_csv(path: str| Path) -> pd.DataFrame:
         pd.DataFrame: DataFrame contendo os dados do Prouni.
     """
     path = Path(path)
-    try:
-        return pd.read_csv(path, sep=";", encoding="utf-8")
-    except UnicodeDecodeError as e:
-        print(f"Erro ao ler o arquivo com utf-8: {e}. Tentando utf-8-sig...")
-        return pd.read_csv(path, sep=";", encoding="utf-8-sig")
+    table = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+        parse_options=pa_csv.ParseOptions(delimiter=";"),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=REQUIRED_COLUMNS,
+            column_types=ARROW_TYPES,
+        ),
+    )
+    return table.to_pandas(
+        types_mapper=_PANDAS_TYPES.get,
+        split_blocks=True,
+        self_destruct=True,
+    )
 
 
 def basic_clean(df: pd.DataFrame) -> pd.DataFrame:
@@ -45,23 +79,21 @@ def basic_clean(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame limpo.
     """
-    df = df.copy()
-
     # Garantir que todas as colunas necessárias estão presentes
     missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing_cols:
         raise ValueError(f"Faltando colunas obrigatórias: {missing_cols}")
 
-    # reduzir para colunas necessárias apenas
+    # reduzir para colunas necessárias apenas (já é uma cópia)
     df = df[REQUIRED_COLUMNS].copy()
 
     # normalizar strings vazias para NA
-    # inclui somente colunas que representam vetores (string, list, dict)
-    obj_cols = df.select_dtypes(include=["object"]).columns.to_list()
+    # inclui colunas de texto (object ou string/pyarrow)
+    obj_cols = df.select_dtypes(include=["object", "string"]).columns.to_list()
     for col in obj_cols:
-        df[col] = df[col].astype("string").str.strip()
-        df.loc[df[col].isin(["", "NA", "N/A", "NULL", "None"]), col] = pd.NA
+        s = df[col].astype("string").str.strip()
+        s = s.mask(s.isin(NA_TOKENS))
         # Converter para object dtype (np.nan) para compatibilidade com sklearn
-        df[col] = df[col].astype("object").fillna(np.nan)
+        df[col] = s.astype("object").fillna(np.nan)
 
     return df
\ No newline at end of file
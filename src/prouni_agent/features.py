@@ -17,6 +17,10 @@ TEXT_COLS = [
     "NOME_TURNO_CURSO_BOLSA",
 ]
 
+# compilados uma vez; usados em todas as chamadas de `_normalize_text`
+_INVALID_CHARS_RE = re.compile(r"[^A-Z0-9 _\-]")
+_MULTI_SPACE_RE = re.compile(r"\s+")
+
 def _normalize_text(s: str) -> str:
     """Normaliza uma string removendo acentuação e convertendo para maiúsculas.
 
@@ -32,10 +36,29 @@ def _normalize_text(s: str) -> str:
     s = unicodedata.normalize("NFKD", s)
     s = "".join(ch for ch in s if not unicodedata.combining(ch))
 
-    s = re.sub(r"[^A-Z0-9 _\-]", " ", s)
-    s = re.sub(r"\s+", " ", s)
+    s = _INVALID_CHARS_RE.sub(" ", s)
+    s = _MULTI_SPACE_RE.sub(" ", s)
     return s
 
+def _normalize_text_series(s: pd.Series) -> pd.Series:
+    """Aplica `_normalize_text` a uma série, uma vez por valor distinto.
+
+    Colunas como MUNICIPIO/NOME_CURSO têm milhões de linhas e poucos milhares
+    de valores distintos, então normalizar só os valores únicos evita o
+    trabalho repetido. O resultado é idêntico ao caminho escalar usado na
+    inferência (mesma função, mesma ordem de passos).
+
+    Args:
+        s (pd.Series): Série de texto (valores ausentes são preservados).
+
+    Returns:
+        pd.Series: Série normalizada.
+    """
+    # storage "python": valores como str, sem passar pelos kernels do pyarrow
+    s = s.astype(pd.StringDtype("python"))
+    mapping = {value: _normalize_text(value) for value in s.dropna().unique()}
+    return s.map(mapping)
+
 def add_age_feature(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
 
@@ -58,8 +81,7 @@ def normalize_text_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
     for col in TEXT_COLS:
-        df[col] = df[col].astype("string")
-        df[col] = df[col].map(lambda x: _normalize_text(x) if isinstance(x, str) else x)
+        df[col] = _normalize_text_series(df[col])
         # Converter para object dtype (np.nan) para compatibilidade com sklearn
         df[col] = df[col].astype("object").fillna(np.nan)
     return df
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import os
+from typing import TYPE_CHECKING
+
 import pandas as pd
-from sklearn.compose import ColumnTransformer
-# fill none values
-from sklearn.impute import SimpleImputer
-from sklearn.linear_model import LogisticRegression
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder
+
+# sklearn só é importado ao construir o pipeline: quem precisa apenas das
+# listas de features (predict.py, service.py) não paga o import no startup
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
 
 CATEGORICAL_FEATURES = [
     "SEXO_BENEFICIARIO",
@@ -25,23 +27,47 @@ NUMERIC_FEATURES = [
     "IDADE",
 ]
 
-def build_pipeline() -> Pipeline:
+MODEL_KINDS = ("logreg", "hgb")
+
+# HistGradientBoosting exige cardinalidade <= max_bins nas features categóricas
+HGB_MAX_BINS = 255
+
+def build_pipeline(kind: str | None = None) -> Pipeline:
     """Constrói o pipeline de modelagem.
 
+    Args:
+        kind (str | None): "logreg" (padrão) ou "hgb". Se None, usa a
+            variável de ambiente PROUNI_MODEL_KIND.
+
     Returns:
         Pipeline: Pipeline de modelagem.
     """
+    kind = kind or os.getenv("PROUNI_MODEL_KIND", "logreg")
+    if kind == "hgb":
+        return build_hgb_pipeline()
+    if kind != "logreg":
+        raise ValueError(f"Modelo desconhecido: {kind} (opções: {MODEL_KINDS})")
+
+    from sklearn.compose import ColumnTransformer
+    # fill none values
+    from sklearn.impute import SimpleImputer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
     cat_pipe = Pipeline(
         steps=[
             ("imputer", SimpleImputer(strategy="most_frequent")),
-            ("ohe", OneHotEncoder(handle_unknown="ignore", min_frequency=10))
+            # matriz esparsa: MUNICIPIO/NOME_CURSO geram milhares de colunas
+            ("ohe", OneHotEncoder(handle_unknown="ignore", min_frequency=10, sparse_output=True))
         ]
     )
 
     num_pipe = Pipeline(
         steps=[
-            ("imputer", SimpleImputer(strategy="median"))
+            ("imputer", SimpleImputer(strategy="median")),
+            # saga só converge bem com features na mesma escala
+            ("scaler", StandardScaler())
         ]
     )
 
@@ -51,6 +77,8 @@ def build_pipeline() -> Pipeline:
             ("num", num_pipe, NUMERIC_FEATURES)
         ],
         remainder="drop",
+        # nunca densifica a saída do OneHotEncoder
+        sparse_threshold=1.0,
         verbose_feature_names_out=False
     )
 
@@ -59,7 +87,65 @@ def build_pipeline() -> Pipeline:
         n_jobs=None, # sklearn uses liblinear default
         # altera o peso das classes para lidar com desbalanceamento
         class_weight="balanced",
-        solver="lbfgs"
+        # saga trabalha direto sobre a matriz esparsa e escala melhor com n grande
+        solver="saga"
+    )
+
+    pipe = Pipeline(
+        steps=[
+            ("pre", pre),
+            ("clf", clf)
+        ]
+    )
+
+    return pipe
+
+
+def build_hgb_pipeline() -> Pipeline:
+    """Constrói o pipeline com HistGradientBoosting (categóricas nativas).
+
+    As categóricas viram códigos inteiros (OrdinalEncoder) em vez de
+    one-hot, e o classificador trata esses códigos como categorias. Treina
+    bem mais rápido que a regressão logística com n grande.
+
+    Returns:
+        Pipeline: Pipeline de modelagem.
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OrdinalEncoder
+
+    cat_pipe = Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            # categorias raras agrupadas para caber em HGB_MAX_BINS;
+            # categorias novas viram -1, que o HGB trata como ausente
+            ("ordinal", OrdinalEncoder(
+                handle_unknown="use_encoded_value",
+                unknown_value=-1,
+                max_categories=HGB_MAX_BINS,
+            ))
+        ]
+    )
+
+    pre = ColumnTransformer(
+        transformers=[
+            ("cat", cat_pipe, CATEGORICAL_FEATURES),
+            # HGB lida com NaN nas numéricas sem imputação
+            ("num", "passthrough", NUMERIC_FEATURES)
+        ],
+        remainder="drop",
+        verbose_feature_names_out=False
+    )
+
+    clf = HistGradientBoostingClassifier(
+        # as primeiras colunas da saída de `pre` são as categóricas
+        categorical_features=list(range(len(CATEGORICAL_FEATURES))),
+        max_bins=HGB_MAX_BINS,
+        class_weight="balanced",
+        random_state=42,
     )
 
     pipe = Pipeline(
@@ -1,12 +1,36 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-import joblib
+import threading
+import weakref
+import numpy as np
 import pandas as pd
+from cachetools import LRUCache
 
-from prouni_agent.features import add_age_feature, normalize_text_columns
-from prouni_agent.modeling import ensure_columns
+from prouni_agent.features import _normalize_text, add_age_feature, normalize_text_columns
+from prouni_agent.modeling import CATEGORICAL_FEATURES, NUMERIC_FEATURES, ensure_columns
+
+FEATURE_COLUMNS = CATEGORICAL_FEATURES + NUMERIC_FEATURES
+
+# colunas que o payload precisa ter para o caminho rápido (IDADE é derivada)
+PAYLOAD_COLUMNS = CATEGORICAL_FEATURES + ["ANO_CONCESSAO_BOLSA", "DATA_NASCIMENTO"]
+
+_NUMERIC_DTYPES = {col: "float64" for col in NUMERIC_FEATURES}
+
+_BIRTH_DATE_FORMATS = (
+    "%d/%m/%Y",
+    "%Y-%m-%d",
+    "%d/%m/%Y %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+# um cache por modelo, com referência fraca: um pipeline substituído (ex:
+# após re-treino) não fica preso na memória pelas entradas do cache
+_PREDICTION_CACHES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_PREDICTION_CACHES_LOCK = threading.Lock()
 
 @dataclass(frozen=True)
 class Prediction:
@@ -15,17 +39,206 @@ class Prediction:
     proba_parcial: float | None
 
 def load_model(model_path: str | Path):
-    obj = joblib.load(model_path)
+    """Carrega o pipeline salvo pelo treino (memoizado por arquivo).
+
+    O arquivo é aberto com `mmap_mode="r"`, então os arrays numpy ficam no
+    page cache do SO e são compartilhados entre workers. O pipeline
+    retornado é compartilhado: não deve ser modificado in-place.
+
+    A memoização usa caminho + inode + mtime: o treino grava o modelo num
+    arquivo novo e o troca atomicamente (`os.replace`), então chamar de novo
+    após re-treinar relê o disco, enquanto o mapeamento antigo continua
+    válido. `clear_model_cache()` libera os pipelines memoizados.
+
+    Mantém joblib (e não pickle puro) justamente por causa do mmap: o
+    arquivo é salvo sem compressão (`compress=0`) em `train.py`.
+    """
+    st = Path(model_path).stat()
+    return _load_model(str(model_path), st.st_mtime_ns, st.st_ino)
+
+@lru_cache(maxsize=4)
+def _load_model(model_path: str, mtime_ns: int, inode: int):
+    import joblib  # só necessário aqui; fora do caminho de import da API
+
+    obj = joblib.load(model_path, mmap_mode="r")
     return obj["pipeline"]
 
+def clear_model_cache() -> None:
+    """Esquece os pipelines memoizados por `load_model`."""
+    _load_model.cache_clear()
+
 def predict_one(model, payload: dict) -> Prediction:
+    # payloads idênticos reaproveitam a predição anterior
+    key = tuple(sorted(payload.items()))
+    try:
+        hash(key)
+    except TypeError:
+        # valores não-hashable (ex: listas) seguem pelo caminho sem cache
+        return _predict_uncached(model, payload)
+
+    cache = _model_cache(model)
+    with _PREDICTION_CACHES_LOCK:
+        cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    prediction = _predict_uncached(model, payload)
+    with _PREDICTION_CACHES_LOCK:
+        cache[key] = prediction
+    return prediction
+
+def _model_cache(model) -> LRUCache:
+    """Cache de predições do modelo (liberado junto com o modelo)."""
+    with _PREDICTION_CACHES_LOCK:
+        cache = _PREDICTION_CACHES.get(model)
+        if cache is None:
+            cache = _PREDICTION_CACHES[model] = LRUCache(maxsize=4096)
+        return cache
+
+def _predict_uncached(model, payload: dict) -> Prediction:
     df = pd.DataFrame([payload])
 
     # Align expected preprocessing steps
     df = add_age_feature(df)
     df = normalize_text_columns(df)
     df = ensure_columns(df)
+    # IDADE sai de add_age_feature como Int64/pd.NA; o pipeline "hgb" não
+    # tem imputer nas numéricas e precisa de float64/NaN (como no treino)
+    df = df.astype(_NUMERIC_DTYPES)
+
+    return _predict_frame(model, df)
+
+def predict_one_fast(
+    model,
+    payload: dict,
+    categorical_dtypes: dict[str, pd.CategoricalDtype] | None = None,
+) -> Prediction:
+    """Predição de uma única linha sem as funções de batch do treino.
+
+    Equivalente a `predict_one`, mas calcula IDADE e normaliza os textos
+    em Python puro, montando o DataFrame só na entrada do pipeline.
+    """
+    return _predict_frame(model, build_single_row(payload, categorical_dtypes))
+
+def categorical_dtypes(model) -> dict[str, pd.CategoricalDtype]:
+    """Congela as categorias vistas no treino em um `CategoricalDtype` por coluna.
+
+    Lê `categories_` do encoder do ramo categórico (`pre` -> `cat`), que
+    pode ser o OneHotEncoder ou o OrdinalEncoder (pipeline "hgb").
+    Retorna dict vazio se o pipeline não tiver esse formato.
+    """
+    try:
+        encoder = model.named_steps["pre"].named_transformers_["cat"][-1]
+        categories = encoder.categories_
+    except (AttributeError, KeyError, TypeError):
+        return {}
+    return {
+        col: pd.CategoricalDtype(cats)
+        for col, cats in zip(CATEGORICAL_FEATURES, categories)
+    }
+
+def build_single_row(
+    payload: dict,
+    categorical_dtypes: dict[str, pd.CategoricalDtype] | None = None,
+) -> pd.DataFrame:
+    """Monta o DataFrame de 1 linha esperado pelo pipeline a partir do payload.
+
+    Replica `add_age_feature` + `normalize_text_columns` + `ensure_columns`
+    para um único registro, evitando cópias e inferência de tipos do pandas.
+
+    Args:
+        payload (dict): Dicionário com as colunas do dataset.
+        categorical_dtypes (dict | None): Dtypes de `categorical_dtypes(model)`.
+            Colunas com valor conhecido (ou ausente) são convertidas; valores
+            novos ficam como object para o encoder ignorá-los.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas `FEATURE_COLUMNS`.
+    """
+    return build_frame([feature_row(payload)], categorical_dtypes)
+
+def build_frame(
+    rows: list[list],
+    categorical_dtypes: dict[str, pd.CategoricalDtype] | None = None,
+) -> pd.DataFrame:
+    """DataFrame do pipeline a partir de linhas já prontas (`feature_row`/`canonical_row`).
+
+    Uma coluna categórica só é convertida se todos os seus valores forem
+    conhecidos (ou ausentes); valores novos ficam como object para o
+    encoder ignorá-los.
+    """
+    df = pd.DataFrame(rows, columns=FEATURE_COLUMNS, dtype=object)
+
+    dtypes = dict(_NUMERIC_DTYPES)
+    for col, dtype in (categorical_dtypes or {}).items():
+        values = df[col]
+        known = values.isna() | values.isin(dtype.categories)
+        if known.all():
+            dtypes[col] = dtype
+
+    return df.astype(dtypes)
+
+def feature_row(payload: dict) -> list:
+    """Valores de `FEATURE_COLUMNS` (na ordem) para um payload."""
+    missing = sorted(set(PAYLOAD_COLUMNS) - payload.keys())
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+
+    ano = payload["ANO_CONCESSAO_BOLSA"]
+    row = [payload[col] for col in CATEGORICAL_FEATURES]
+    row.append(ano)
+    row.append(derive_age(ano, payload["DATA_NASCIMENTO"]))
+    return canonical_row(row)
+
+def canonical_row(values: list) -> list:
+    """Normaliza uma linha posicional na ordem de `FEATURE_COLUMNS` (in-place).
+
+    Textos passam por `_normalize_text`, IDADE fora de 14–80 é descartada e
+    valores ausentes (None ou não-texto nas categóricas) viram NaN.
+    """
+    for i in range(len(CATEGORICAL_FEATURES)):
+        v = values[i]
+        values[i] = _normalize_text(v) if isinstance(v, str) else np.nan
+    ano, idade = values[-2], _clamp_age(values[-1])
+    values[-2] = np.nan if ano is None else ano
+    values[-1] = np.nan if idade is None else idade
+    return values
+
+def derive_age(ano, data_nascimento) -> int | None:
+    """Idade no ano de concessão, com as mesmas regras de `add_age_feature`.
+
+    Retorna None se faltar ano/data ou se a idade ficar fora de 14–80.
+    """
+    birth_year = _birth_year(data_nascimento)
+    if ano is None or birth_year is None:
+        return None
+    return _clamp_age(int(ano) - birth_year)
+
+def _clamp_age(idade: int | None) -> int | None:
+    """Descarta (None) idades fora de 14–80, como em `add_age_feature`."""
+    if idade is None or idade < 14 or idade > 80:
+        return None
+    return idade
+
+def _birth_year(value) -> int | None:
+    """Extrai o ano de nascimento (dd/mm/yyyy, yyyy-mm-dd ou datetime)."""
+    if isinstance(value, (date, datetime)):
+        return value.year
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    text = value.strip()
+    for fmt in _BIRTH_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).year
+        except ValueError:
+            continue
+
+    # formatos incomuns: mesmo parser usado em add_age_feature
+    dt = pd.to_datetime(text, errors="coerce", dayfirst=True)
+    return None if pd.isna(dt) else int(dt.year)
 
+def _predict_frame(model, df: pd.DataFrame) -> Prediction:
     label = model.predict(df)[0]
 
     proba_integral = None
@@ -33,10 +246,11 @@ def predict_one(model, payload: dict) -> Prediction:
     if hasattr(model, "predict_proba"):
         proba = model.predict_proba(df)[0]
         classes = list(getattr(model, "classes_", []))
+        # .item() devolve float nativo direto, sem escalar numpy intermediário
         if "INTEGRAL" in classes:
-            proba_integral = float(proba[classes.index("INTEGRAL")])
+            proba_integral = proba.item(classes.index("INTEGRAL"))
         if "PARCIAL" in classes:
-            proba_parcial = float(proba[classes.index("PARCIAL")])
+            proba_parcial = proba.item(classes.index("PARCIAL"))
 
     return Prediction(
         label=str(label),
@@ -3,10 +3,36 @@ Schemas Pydantic para validação de entrada/saída da API.
 
 Este módulo centraliza todos os modelos de dados (DTOs - Data Transfer Objects)
 utilizados nos endpoints da API, seguindo o padrão de separação de responsabilidades.
+
+Entradas (vindas do cliente) são `BaseModel` e sempre validadas. Saídas são
+produzidas apenas pelo servidor e por isso são `TypedDict`: os handlers
+retornam dicts simples, sem construir/validar um modelo Pydantic por resposta.
+
+Os schemas de resposta existem só para documentação (OpenAPI). As rotas são
+declaradas com `response_model=None` e `responses={200: {"model": ...}}` e
+retornam `ORJSONResponse(content=...)`, então o FastAPI não revalida a saída.
 """
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Annotated, Literal
+
+from typing_extensions import TypedDict
+
+from pydantic import BaseModel, Field, field_validator
+
+from prouni_agent.features import _normalize_text
+
+
+# VALORES ACEITOS NO ADK (já normalizados: maiúsculas, sem acento)
+
+Sexo = Literal["M", "F"]
+Raca = Literal["BRANCA", "PRETA", "PARDA", "AMARELA", "INDIGENA", "NAO INFORMADA"]
+Turno = Literal["MATUTINO", "VESPERTINO", "NOTURNO", "INTEGRAL", "CURSO A DISTANCIA"]
+Modalidade = Literal["PRESENCIAL", "EAD"]
+UF = Literal[
+    "AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG", "PA",
+    "PB", "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO",
+]
 
 
 # SCHEMAS DA API PRINCIPAL (/api/v1)
@@ -78,35 +104,31 @@ class PredictRequest(BaseModel):
         }
 
 
-class PredictResponse(BaseModel):
+class PredictResponse(TypedDict):
     """Schema de saída da predição (formato técnico)."""
-    label: str = Field(..., description="Classe predita (INTEGRAL ou PARCIAL)")
-    proba_integral: float | None = Field(
-        None,
-        description="Probabilidade de bolsa integral (0.0 a 1.0)",
-        ge=0.0,
-        le=1.0
-    )
-    proba_parcial: float | None = Field(
-        None,
-        description="Probabilidade de bolsa parcial (0.0 a 1.0)",
-        ge=0.0,
-        le=1.0
-    )
-
-
-class HealthResponse(BaseModel):
+    label: Annotated[str, Field(description="Classe predita (INTEGRAL ou PARCIAL)")]
+    proba_integral: Annotated[
+        float | None,
+        Field(description="Probabilidade de bolsa integral (0.0 a 1.0)", ge=0.0, le=1.0),
+    ]
+    proba_parcial: Annotated[
+        float | None,
+        Field(description="Probabilidade de bolsa parcial (0.0 a 1.0)", ge=0.0, le=1.0),
+    ]
+
+
+class HealthResponse(TypedDict):
     """Schema de resposta do health check."""
-    status: str = Field(..., description="Status da API (ok ou error)")
-    model_path: str = Field(..., description="Caminho do modelo carregado")
-    model_loaded: bool = Field(..., description="Modelo carregado com sucesso?")
+    status: Annotated[str, Field(description="Status da API (ok ou error)")]
+    model_path: Annotated[str, Field(description="Caminho do modelo carregado")]
+    model_loaded: Annotated[bool, Field(description="Modelo carregado com sucesso?")]
 
 
-class RootResponse(BaseModel):
+class RootResponse(TypedDict):
     """Schema de resposta do endpoint raiz."""
-    message: str = Field(..., description="Mensagem de boas-vindas")
-    version: str = Field(..., description="Versão da API")
-    endpoints: dict[str, str] = Field(..., description="Endpoints disponíveis")
+    message: Annotated[str, Field(description="Mensagem de boas-vindas")]
+    version: Annotated[str, Field(description="Versão da API")]
+    endpoints: Annotated[dict[str, str], Field(description="Endpoints disponíveis")]
 
 
 # SCHEMAS DO ADK (/adk) - Formato conversacional
@@ -124,22 +146,19 @@ class ADKPredictRequest(BaseModel):
         ge=14,
         le=80
     )
-    sexo: str | None = Field(
+    sexo: Sexo | None = Field(
         None,
         description="Sexo (M ou F)"
     )
-    raca: str | None = Field(
+    raca: Raca | None = Field(
         None,
-
-# TIPOS E DATACLASSES
-
         description="Raça/cor autodeclarada (BRANCA, PRETA, PARDA, AMARELA, INDIGENA)"
     )
     pcd: bool | None = Field(
         None,
         description="É pessoa com deficiência?"
     )
-    uf: str | None = Field(
+    uf: UF | None = Field(
         None,
         description="Estado (sigla, ex: SP, RJ)"
     )
@@ -151,15 +170,21 @@ class ADKPredictRequest(BaseModel):
         None,
         description="Curso desejado (ex: DIREITO, MEDICINA, ENGENHARIA)"
     )
-    turno: str | None = Field(
+    turno: Turno | None = Field(
         None,
         description="Turno preferido (MATUTINO, VESPERTINO, NOTURNO, INTEGRAL)"
     )
-    modalidade: str | None = Field(
+    modalidade: Modalidade | None = Field(
         None,
         description="Modalidade (PRESENCIAL ou EAD)"
     )
 
+    @field_validator("sexo", "raca", "uf", "turno", "modalidade", mode="before")
+    @classmethod
+    def normalize_categoria(cls, v):
+        """Aceita caixa/acentuação livres (ex: 'indígena', 'sp') antes do Literal."""
+        return _normalize_text(v) if isinstance(v, str) else v
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -176,41 +201,37 @@ class ADKPredictRequest(BaseModel):
         }
 
 
-class ADKPredictResponse(BaseModel):
+class ADKPredictResponse(TypedDict):
     """
     Resposta humanizada para o ADK.
     
     Formato otimizado para ser apresentado em linguagem natural pelo agente.
     Probabilidades em percentual (0-100) para facilitar comunicação.
     """
-    tipo_bolsa: str = Field(
-        ...,
-        description="Tipo de bolsa mais provável (INTEGRAL ou PARCIAL)"
-    )
-    probabilidade_integral: float = Field(
-        ...,
-        description="Chance de bolsa integral (0 a 100%)",
-        ge=0.0,
-        le=100.0
-    )
-    probabilidade_parcial: float = Field(
-        ...,
-        description="Chance de bolsa parcial (0 a 100%)",
-        ge=0.0,
-        le=100.0
-    )
-    confianca: str = Field(
-        ...,
-        description="Nível de confiança da predição (ALTA, MÉDIA, BAIXA)"
-    )
-    mensagem: str = Field(
-        ...,
-        description="Mensagem explicativa em linguagem natural"
-    )
-
-
-class ADKHealthResponse(BaseModel):
+    tipo_bolsa: Annotated[
+        str,
+        Field(description="Tipo de bolsa mais provável (INTEGRAL ou PARCIAL)"),
+    ]
+    probabilidade_integral: Annotated[
+        float,
+        Field(description="Chance de bolsa integral (0 a 100%)", ge=0.0, le=100.0),
+    ]
+    probabilidade_parcial: Annotated[
+        float,
+        Field(description="Chance de bolsa parcial (0 a 100%)", ge=0.0, le=100.0),
+    ]
+    confianca: Annotated[
+        str,
+        Field(description="Nível de confiança da predição (ALTA, MÉDIA, BAIXA)"),
+    ]
+    mensagem: Annotated[
+        str,
+        Field(description="Mensagem explicativa em linguagem natural"),
+    ]
+
+
+class ADKHealthResponse(TypedDict):
     """Health check específico para ADK."""
-    status: str = Field(..., description="Status do serviço")
-    service: str = Field(..., description="Nome do serviço")
-    available_tools: list[str] = Field(..., description="Tools disponíveis")
\ No newline at end of file
+    status: Annotated[str, Field(description="Status do serviço")]
+    service: Annotated[str, Field(description="Nome do serviço")]
+    available_tools: Annotated[list[str], Field(description="Tools disponíveis")]
@@ -6,69 +6,209 @@ Os controllers (api.py, adk.py) apenas validam input e formatam output.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Protocol
 
-import joblib
+from cachetools import TTLCache
 
 from prouni_agent.config import Paths
-from prouni_agent.features import add_age_feature, normalize_text_columns
-from prouni_agent.modeling import ensure_columns
-import pandas as pd
+from prouni_agent.predict import (
+    FEATURE_COLUMNS,
+    build_frame,
+    canonical_row,
+    categorical_dtypes,
+    clear_model_cache,
+    feature_row,
+    load_model as load_pipeline,
+)
+from prouni_agent.schemas import ADKPredictResponse, PredictResponse
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-@dataclass(frozen=True)
+# Região de cada UF (montado uma vez no import)
+_UF_TO_REGION: dict[str, str] = {
+    # Norte
+    "AC": "NORTE", "AP": "NORTE", "AM": "NORTE", "PA": "NORTE",
+    "RO": "NORTE", "RR": "NORTE", "TO": "NORTE",
+    # Nordeste
+    "AL": "NORDESTE", "BA": "NORDESTE", "CE": "NORDESTE", "MA": "NORDESTE",
+    "PB": "NORDESTE", "PE": "NORDESTE", "PI": "NORDESTE", "RN": "NORDESTE", "SE": "NORDESTE",
+    # Centro-Oeste
+    "DF": "CENTRO-OESTE", "GO": "CENTRO-OESTE", "MT": "CENTRO-OESTE", "MS": "CENTRO-OESTE",
+    # Sudeste
+    "ES": "SUDESTE", "MG": "SUDESTE", "RJ": "SUDESTE", "SP": "SUDESTE",
+    # Sul
+    "PR": "SUL", "RS": "SUL", "SC": "SUL",
+}
+
+# Payloads usados para "aquecer" o pipeline no startup (valores vistos no treino)
+WARMUP_PAYLOAD: dict[str, Any] = {
+    "ANO_CONCESSAO_BOLSA": 2020,
+    "SEXO_BENEFICIARIO": "F",
+    "RACA_BENEFICIARIO": "PARDA",
+    "DATA_NASCIMENTO": "2000-01-01",
+    "BENEFICIARIO_DEFICIENTE_FISICO": "N",
+    "REGIAO_BENEFICIARIO": "SUDESTE",
+    "UF_BENEFICIARIO": "SP",
+    "MUNICIPIO_BENEFICIARIO": "SAO PAULO",
+    "MODALIDADE_ENSINO_BOLSA": "PRESENCIAL",
+    "NOME_CURSO_BOLSA": "DIREITO",
+    "NOME_TURNO_CURSO_BOLSA": "NOTURNO",
+}
+WARMUP_CONVERSATIONAL: dict[str, Any] = {
+    "idade": 22,
+    "sexo": "M",
+    "raca": "BRANCA",
+    "pcd": False,
+    "uf": "RJ",
+    "curso": "ADMINISTRACAO",
+    "turno": "NOTURNO",
+    "modalidade": "PRESENCIAL",
+}
+
+# Mensagens pré-montadas por (label, confiança); só a probabilidade é formatada
+_MESSAGE_TEMPLATES: dict[tuple[str, str], str] = {
+    (label, confianca): (
+        "Com base no seu perfil, você tem {prob:.1f}% de chance de "
+        f"conseguir uma bolsa {tipo} no PROUNI. "
+        f"A confiança desta predição é {confianca.lower()}."
+    )
+    for label, tipo in (("INTEGRAL", "INTEGRAL (100%)"), ("PARCIAL", "PARCIAL (50%)"))
+    for confianca in ("ALTA", "MÉDIA", "BAIXA")
+}
+
+
+@lru_cache(maxsize=2048)
+def _format_message(label: str, prob_tenths: int, confianca: str) -> str:
+    """Mensagem para (label, probabilidade em décimos de %, confiança), memoizada."""
+    return _MESSAGE_TEMPLATES[(label, confianca)].format(prob=prob_tenths / 10)
+
+
+@dataclass(frozen=True, slots=True)
 class PredictionResult:
     """Resultado padronizado de uma predição."""
     label: str
     proba_integral: float
     proba_parcial: float
+    # derivado das probabilidades; calculado uma vez em __post_init__
+    confidence_level: str = field(init=False, compare=False)
     
-    @property
-    def confidence_level(self) -> str:
+    def __post_init__(self) -> None:
         """Calcula nível de confiança baseado na diferença entre probabilidades."""
         diff = abs(self.proba_integral - self.proba_parcial) * 100
         if diff > 40:
-            return "ALTA"
+            level = "ALTA"
         elif diff > 20:
-            return "MÉDIA"
-        return "BAIXA"
+            level = "MÉDIA"
+        else:
+            level = "BAIXA"
+        object.__setattr__(self, "confidence_level", level)
     
     def to_message(self, lang: str = "pt-BR") -> str:
         """Gera mensagem humanizada para apresentação."""
-        prob = self.proba_integral if self.label == "INTEGRAL" else self.proba_parcial
-        tipo = "INTEGRAL (100%)" if self.label == "INTEGRAL" else "PARCIAL (50%)"
-        return (
-            f"Com base no seu perfil, você tem {prob * 100:.1f}% de chance de "
-            f"conseguir uma bolsa {tipo} no PROUNI. "
-            f"A confiança desta predição é {self.confidence_level.lower()}."
-        )
+        if self.label == "INTEGRAL":
+            label, prob = "INTEGRAL", self.proba_integral
+        else:
+            label, prob = "PARCIAL", self.proba_parcial
+        # a mensagem mostra 1 casa decimal: décimos de ponto percentual
+        return _format_message(label, round(prob * 1000), self.confidence_level)
+    
+    def to_response(self) -> PredictResponse:
+        """Corpo de resposta de /api/v1/predict (dict pronto para serializar)."""
+        return {
+            "label": self.label,
+            "proba_integral": self.proba_integral,
+            "proba_parcial": self.proba_parcial,
+        }
+    
+    def to_adk_response(self) -> ADKPredictResponse:
+        """Corpo de resposta de /adk/predict-bolsa (dict pronto para serializar)."""
+        return {
+            "tipo_bolsa": self.label,
+            "probabilidade_integral": round(self.proba_integral * 100, 1),
+            "probabilidade_parcial": round(self.proba_parcial * 100, 1),
+            "confianca": self.confidence_level,
+            "mensagem": self.to_message(),
+        }
+
+
+class CacheBackend(Protocol):
+    """Interface mínima de cache de predições (permite trocar por Redis)."""
+
+    def get(self, key: str) -> PredictionResult | None: ...
+
+    def set(self, key: str, value: PredictionResult) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class TTLCacheBackend:
+    """Cache em memória com LRU + expiração (cachetools), seguro entre threads."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> PredictionResult | None:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, value: PredictionResult) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
 
 
 class PredictionService:
     """
-    Serviço singleton para predição de bolsas.
+    Serviço para predição de bolsas.
     
     Encapsula carregamento do modelo e lógica de predição.
-    Projetado para ser injetado nos endpoints via dependency injection.
+    Projetado para ser injetado nos endpoints via dependency injection;
+    a API usa a instância única `PREDICTION_SERVICE`, criada no import.
     """
     
-    _instance: "PredictionService | None" = None
+    _model_path: Path
     _model: Any = None
+    _preprocessor: Any = None
+    _estimator: Any = None
+    _predict_proba: Any = None
+    _idx_integral: int | None = None
+    _idx_parcial: int | None = None
+    _categorical_dtypes: dict[str, Any] = {}
     
-    def __new__(cls) -> "PredictionService":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    def __init__(self, cache: CacheBackend | None = None) -> None:
+        self._cache: CacheBackend = cache if cache is not None else TTLCacheBackend()
+        # DataFrame de 1 linha reaproveitado entre predições (colunas e dtypes
+        # fixos); só é alterado/lido com o lock, pois é compartilhado
+        self._row_template = build_frame([[None] * len(FEATURE_COLUMNS)])
+        self._row_lock = threading.Lock()
+        self.reload_config()
+    
+    def reload_config(self) -> None:
+        """Relê a configuração do ambiente (PROUNI_MODEL_PATH).
+        
+        Chamado uma vez na criação do serviço; chame de novo para aplicar
+        uma mudança de env var em runtime (antes de `load_model()`).
+        """
+        self._model_path = Path(
+            os.getenv("PROUNI_MODEL_PATH", str(Paths().default_model_path))
+        )
     
     @property
     def model_path(self) -> Path:
         """Caminho do modelo (configurável via env var)."""
-        import os
-        paths = Paths()
-        return Path(os.getenv("PROUNI_MODEL_PATH", str(paths.default_model_path)))
+        return self._model_path
     
     @property
     def is_loaded(self) -> bool:
@@ -85,12 +225,56 @@ class PredictionService:
         if not self.model_exists:
             raise FileNotFoundError(f"Modelo não encontrado: {self.model_path}")
         
-        bundle = joblib.load(self.model_path)
-        self._model = bundle["pipeline"]
+        # memoizado por inode/mtime: um modelo re-treinado é relido do disco
+        self._model = load_pipeline(self.model_path)
+        # Pipeline separado: o pré-processamento roda uma vez por predição,
+        # em vez de uma vez no predict e outra no predict_proba
+        if len(getattr(self._model, "steps", [])) > 1:
+            self._preprocessor = self._model[:-1]
+            self._estimator = self._model[-1]
+        else:
+            self._preprocessor = None
+            self._estimator = self._model
+        # posições das classes e predict_proba resolvidos uma vez só
+        classes = list(getattr(self._estimator, "classes_", []))
+        self._idx_integral = classes.index("INTEGRAL") if "INTEGRAL" in classes else None
+        self._idx_parcial = classes.index("PARCIAL") if "PARCIAL" in classes else None
+        self._predict_proba = getattr(self._estimator, "predict_proba", None)
+        # categorias do treino congeladas para o DataFrame de inferência
+        self._categorical_dtypes = categorical_dtypes(self._model)
+        self.cache_clear()
     
     def unload_model(self) -> None:
-        """Descarrega modelo da memória."""
+        """Descarrega modelo da memória (inclusive a cópia memoizada)."""
+        clear_model_cache()
         self._model = None
+        self._preprocessor = None
+        self._estimator = None
+        self._predict_proba = None
+        self._idx_integral = None
+        self._idx_parcial = None
+        self._categorical_dtypes = {}
+        self.cache_clear()
+    
+    def warmup(self) -> None:
+        """
+        Carrega o modelo (se necessário) e executa predições de aquecimento.
+        
+        Passa pelos caminhos de 1 linha e de batch sem usar o cache, para
+        que a primeira requisição real não pague as alocações iniciais do
+        pandas/sklearn. Chamado uma vez no startup da API.
+        """
+        if not self.is_loaded:
+            self.load_model()
+        
+        rows = [feature_row(WARMUP_PAYLOAD), self.conversational_row(**WARMUP_CONVERSATIONAL)]
+        for row in rows:
+            self._predict_single(row)
+        self._predict_frame(build_frame(rows, self._categorical_dtypes))
+    
+    def cache_clear(self) -> None:
+        """Descarta todas as predições em cache."""
+        self._cache.clear()
     
     def predict(self, payload: dict[str, Any]) -> PredictionResult:
         """
@@ -107,35 +291,117 @@ class PredictionService:
             RuntimeError: Se modelo não estiver carregado
             ValueError: Se payload inválido
         """
-        if not self.is_loaded:
+        return self.predict_from_row(feature_row(payload))
+    
+    def predict_from_row(self, row: list) -> PredictionResult:
+        """
+        Executa predição para uma linha posicional (ordem de `FEATURE_COLUMNS`).
+        
+        A linha deve vir de `feature_row` ou `conversational_row`. Linhas
+        equivalentes para o modelo são respondidas direto do cache (sem
+        DataFrame nem sklearn).
+        
+        Raises:
+            RuntimeError: Se modelo não estiver carregado
+        """
+        key = self._cache_key(row)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._predict_single(row)
+        self._cache.set(key, result)
+        return result
+    
+    def get_cached(self, row: list) -> PredictionResult | None:
+        """Retorna a predição em cache para a linha, se houver."""
+        return self._cache.get(self._cache_key(row))
+    
+    def predict_batch(self, payloads: list[dict[str, Any]]) -> list[PredictionResult]:
+        """
+        Executa predição para vários payloads com uma única chamada ao pipeline.
+        
+        Raises:
+            RuntimeError: Se modelo não estiver carregado
+            ValueError: Se algum payload for inválido
+        """
+        return self.predict_rows([feature_row(payload) for payload in payloads])
+    
+    def predict_rows(self, rows: list[list]) -> list[PredictionResult]:
+        """
+        Versão de `predict_from_row` para N linhas, com uma única chamada ao pipeline.
+        
+        Linhas já em cache não são recalculadas; as demais viram um
+        DataFrame de N linhas, amortizando o overhead do sklearn.
+        
+        Raises:
+            RuntimeError: Se modelo não estiver carregado
+        """
+        keys = [self._cache_key(row) for row in rows]
+        results = [self._cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        if len(missing) == 1:
+            i = missing[0]
+            results[i] = self._predict_single(rows[i])
+            self._cache.set(keys[i], results[i])
+        elif missing:
+            df = build_frame([rows[i] for i in missing], self._categorical_dtypes)
+            for i, result in zip(missing, self._predict_frame(df)):
+                results[i] = result
+                self._cache.set(keys[i], result)
+        
+        return results
+    
+    def _predict_single(self, row: list) -> PredictionResult:
+        """
+        Predição de 1 linha sobre o DataFrame template, sem construir um novo.
+        
+        As categóricas ficam como object (sem o cast para `CategoricalDtype`
+        de `build_frame`), que é o que o encoder recebe de qualquer forma.
+        """
+        with self._row_lock:
+            template = self._row_template
+            for i, value in enumerate(row):
+                template.iat[0, i] = value
+            return self._predict_frame(template)[0]
+    
+    def _predict_frame(self, df: pd.DataFrame) -> list[PredictionResult]:
+        """Roda o pipeline sobre um DataFrame pronto (uma predição por linha)."""
+        # Única verificação de modelo carregado: acertos de cache não chegam
+        # aqui (e o cache é limpo ao descarregar o modelo)
+        if self._estimator is None:
             raise RuntimeError("Modelo não carregado. Chame load_model() primeiro.")
         
-        # Prepara DataFrame
-        df = pd.DataFrame([payload])
-        df = add_age_feature(df)
-        df = normalize_text_columns(df)
-        df = ensure_columns(df)
+        X = df if self._preprocessor is None else self._preprocessor.transform(df)
         
         # Predição
-        label = self._model.predict(df)[0]
+        labels = self._estimator.predict(X)
         
         # Probabilidades
-        proba_integral = 0.5
-        proba_parcial = 0.5
-        
-        if hasattr(self._model, "predict_proba"):
-            proba = self._model.predict_proba(df)[0]
-            classes = list(getattr(self._model, "classes_", []))
-            if "INTEGRAL" in classes:
-                proba_integral = float(proba[classes.index("INTEGRAL")])
-            if "PARCIAL" in classes:
-                proba_parcial = float(proba[classes.index("PARCIAL")])
-        
-        return PredictionResult(
-            label=str(label),
-            proba_integral=proba_integral,
-            proba_parcial=proba_parcial,
-        )
+        proba_integral = [0.5] * len(df)
+        proba_parcial = [0.5] * len(df)
+        
+        if self._predict_proba is not None:
+            proba = self._predict_proba(X)
+            # floats nativos direto do array: .item() para 1 linha (caso comum,
+            # sem criar a view da coluna), .tolist() da coluna para N linhas
+            single = len(df) == 1
+            if self._idx_integral is not None:
+                proba_integral = (
+                    [proba.item(0, self._idx_integral)] if single
+                    else proba[:, self._idx_integral].tolist()
+                )
+            if self._idx_parcial is not None:
+                proba_parcial = (
+                    [proba.item(0, self._idx_parcial)] if single
+                    else proba[:, self._idx_parcial].tolist()
+                )
+        
+        return [
+            PredictionResult(label=str(label), proba_integral=p_int, proba_parcial=p_par)
+            for label, p_int, p_par in zip(labels, proba_integral, proba_parcial)
+        ]
     
     def predict_from_conversational(
         self,
@@ -155,57 +421,80 @@ class PredictionService:
         Converte automaticamente parâmetros simplificados para o formato
         esperado pelo modelo.
         """
-        # Ano base do modelo
-        ano_base = 2020
-        
-        # Calcula data de nascimento aproximada
-        data_nascimento = None
-        if idade is not None:
-            ano_nascimento = ano_base - idade
-            data_nascimento = f"{ano_nascimento}-01-01"
-        
-        # Monta payload no formato do modelo
-        payload = {
-            "ANO_CONCESSAO_BOLSA": ano_base,
-            "SEXO_BENEFICIARIO": sexo,
-            "RACA_BENEFICIARIO": raca,
-            "DATA_NASCIMENTO": data_nascimento,
-            "BENEFICIARIO_DEFICIENTE_FISICO": "S" if pcd else ("N" if pcd is False else None),
-            "REGIAO_BENEFICIARIO": self._infer_region(uf),
-            "UF_BENEFICIARIO": uf,
-            "MUNICIPIO_BENEFICIARIO": municipio,
-            "MODALIDADE_ENSINO_BOLSA": modalidade,
-            "NOME_CURSO_BOLSA": curso,
-            "NOME_TURNO_CURSO_BOLSA": turno,
-        }
+        return self.predict_from_row(self.conversational_row(
+            idade=idade,
+            sexo=sexo,
+            raca=raca,
+            pcd=pcd,
+            uf=uf,
+            municipio=municipio,
+            curso=curso,
+            turno=turno,
+            modalidade=modalidade,
+        ))
+    
+    def conversational_row(
+        self,
+        idade: int | None = None,
+        sexo: str | None = None,
+        raca: str | None = None,
+        pcd: bool | None = None,
+        uf: str | None = None,
+        municipio: str | None = None,
+        curso: str | None = None,
+        turno: str | None = None,
+        modalidade: str | None = None,
+    ) -> list:
+        """
+        Converte parâmetros conversacionais na linha posicional do modelo.
         
-        return self.predict(payload)
+        Preenche direto a ordem de `FEATURE_COLUMNS` (sem montar o payload
+        com DATA_NASCIMENTO só para derivar a idade de volta).
+        """
+        return canonical_row([
+            sexo,
+            raca,
+            "S" if pcd else ("N" if pcd is False else None),
+            self._infer_region(uf),
+            uf,
+            municipio,
+            modalidade,
+            curso,
+            turno,
+            # Ano base do modelo
+            2020,
+            idade,
+        ])
+    
+    @staticmethod
+    def _cache_key(row: list) -> str:
+        """
+        Gera chave estável (SHA-256) a partir da linha canonicalizada.
+        
+        A linha já tem textos normalizados como no treino e a idade no lugar
+        de DATA_NASCIMENTO, então "sp"/"SP" ou duas datas do mesmo ano caem
+        na mesma entrada do cache.
+        """
+        raw = json.dumps(row, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
     
     @staticmethod
     def _infer_region(uf: str | None) -> str | None:
         """Infere região a partir da UF."""
         if not uf:
             return None
-        
-        uf_to_region = {
-            # Norte
-            "AC": "NORTE", "AP": "NORTE", "AM": "NORTE", "PA": "NORTE",
-            "RO": "NORTE", "RR": "NORTE", "TO": "NORTE",
-            # Nordeste
-            "AL": "NORDESTE", "BA": "NORDESTE", "CE": "NORDESTE", "MA": "NORDESTE",
-            "PB": "NORDESTE", "PE": "NORDESTE", "PI": "NORDESTE", "RN": "NORDESTE", "SE": "NORDESTE",
-            # Centro-Oeste
-            "DF": "CENTRO-OESTE", "GO": "CENTRO-OESTE", "MT": "CENTRO-OESTE", "MS": "CENTRO-OESTE",
-            # Sudeste
-            "ES": "SUDESTE", "MG": "SUDESTE", "RJ": "SUDESTE", "SP": "SUDESTE",
-            # Sul
-            "PR": "SUL", "RS": "SUL", "SC": "SUL",
-        }
-        return uf_to_region.get(uf.upper())
+        # caminho comum: UF já em maiúsculas (validada pelo schema)
+        region = _UF_TO_REGION.get(uf)
+        return region if region is not None else _UF_TO_REGION.get(uf.upper())
 
 
 # INSTÂNCIA GLOBAL (SINGLETON)
 
+# Criada uma única vez no import (que o Python já serializa entre threads),
+# sem a checagem "se não existe, cria" sujeita a corrida
+PREDICTION_SERVICE = PredictionService()
+
+
 def get_prediction_service() -> PredictionService:
     """Dependency injection para FastAPI."""
-    return PredictionService()
+    return PREDICTION_SERVICE
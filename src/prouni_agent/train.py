@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import os
 from pathlib import Path
 import joblib
 import pandas as pd
@@ -10,7 +11,12 @@ from sklearn.model_selection import train_test_split
 
 from src.prouni_agent.data import read_prouni_csv, basic_clean
 from src.prouni_agent.features import add_age_feature, normalize_text_columns, make_xy
-from src.prouni_agent.modeling import build_pipeline, ensure_columns
+from src.prouni_agent.modeling import (
+    CATEGORICAL_FEATURES,
+    NUMERIC_FEATURES,
+    build_pipeline,
+    ensure_columns,
+)
 
 def train(data_path: Path, out_path: Path) -> None:
     df = read_prouni_csv(data_path)
@@ -20,14 +26,24 @@ def train(data_path: Path, out_path: Path) -> None:
 
     X, y = make_xy(df)
 
-    # remove rows without target
+    # remove rows without target (boolean indexing already returns new frames)
     mask = y.notna()
-    X = X.loc[mask].copy()
-    y = y.loc[mask].copy()
+    X = X.loc[mask]
+    y = y.loc[mask]
 
     # remove rows without minimal features
     X = ensure_columns(X)
 
+    # category dtype: repeated strings (municipio, curso, ...) stored once,
+    # so the split below copies small integer codes instead of object columns.
+    # numeric features as float64 (NaN for missing), the same dtype used at
+    # inference; the hgb pipeline passes them through without an imputer
+    X = X.astype(
+        {col: "category" for col in CATEGORICAL_FEATURES}
+        | {col: "float64" for col in NUMERIC_FEATURES}
+    )
+    y = y.astype("category")
+
     X_train, X_test, y_train, y_test = train_test_split(
         X, y,
         test_size=0.2,
@@ -53,14 +69,21 @@ def train(data_path: Path, out_path: Path) -> None:
             print(f"\nROC-AUC (INTEGRAL as positive): {auc:.4f}")
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    # uncompressed so predict.load_model can memory-map the numpy arrays.
+    # A running API maps this file: never rewrite it in place. Dump to a temp
+    # file next to it and swap it in atomically, so the path points at a new
+    # inode and existing mappings keep reading the old model.
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
     joblib.dump(
         {
             "pipeline": pipe,
             "classes": getattr(pipe, "classes_", None),
             "feature_columns": list(X.columns),
         },
-        out_path,
+        tmp_path,
+        compress=0,
     )
+    os.replace(tmp_path, out_path)
     print(f"\nSaved model to: {out_path}")
 
 def main() -> None: